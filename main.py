@@ -1,18 +1,30 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 from typing import Optional, List
 import google.generativeai as genai
 import os
 from dotenv import load_dotenv
-import json
 
 # Load environment variables from a .env file
 load_dotenv()
 
 # Initialize Google AI with your API key
 # Make sure you have a .env file with GOOGLE_AI_API_KEY="your_key_here"
-genai.configure(api_key=os.getenv("GOOGLE_AI_API_KEY"))
+GOOGLE_AI_API_KEY = os.getenv("GOOGLE_AI_API_KEY")
+
+# Set STRICT_STARTUP=1 to refuse to start without an API key instead of failing on each request
+STRICT_STARTUP = os.getenv("STRICT_STARTUP", "").lower() in ("1", "true", "yes")
+if STRICT_STARTUP and not GOOGLE_AI_API_KEY:
+    raise RuntimeError("GOOGLE_AI_API_KEY not set. Please check your .env file.")
+
+genai.configure(api_key=GOOGLE_AI_API_KEY)
+
+# Build the model once and reuse it for every request
+MODEL = genai.GenerativeModel(os.getenv("GEMINI_MODEL", "gemini-1.5-pro-latest"))
 
 app = FastAPI(
     title="Smart Translator API",
@@ -20,24 +32,38 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Comma-separated list of front-end origins allowed to call the API,
+# e.g. ALLOWED_ORIGINS=http://127.0.0.1:5500,https://your-site.com
+# Falls back to "*" for development when it's not set
+ALLOWED_ORIGINS = [origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "").split(",") if origin.strip()] or ["*"]
+
 # This is CRUCIAL for allowing your front-end (Live Server)
 # to talk to your back-end (this Python file).
 app.add_middleware(
     CORSMiddleware,
-    # You can be more specific, but for development, "*" is okay.
     # The default for Live Server is often http://127.0.0.1:5500
-    allow_origins=["*"], 
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # Let browsers cache the preflight for a day
 )
 
+# Compress larger responses (language list, long translations); added after CORS
+# so it wraps the CORS middleware and compresses the final response
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
+# Input limits for translation requests
+MAX_TEXT_LENGTH = 5000
+MAX_CONTEXT_LENGTH = 1000
+
 # Pydantic models (defines the structure of data)
 class TranslationRequest(BaseModel):
-    text: str
+    # Length limits are checked before any LLM call (the UI caps input at 5000 characters)
+    text: str = Field(..., min_length=1, max_length=MAX_TEXT_LENGTH)
     source_language: Optional[str] = "auto"
     target_language: str
-    context: Optional[str] = None
+    context: Optional[str] = Field(None, max_length=MAX_CONTEXT_LENGTH)
 
 class TranslationResponse(BaseModel):
     translated_text: str
@@ -65,50 +91,78 @@ SUPPORTED_LANGUAGES = [
     # ... include the rest of the languages from your original file
 ]
 
+# Lookup tables built once at import so the hot paths don't rescan the list
+_LANG_NAME = {lang["code"]: lang["name"] for lang in SUPPORTED_LANGUAGES}
+_LANG_RESPONSE = [LanguageInfo(**lang) for lang in SUPPORTED_LANGUAGES]
+
+# Pydantic's default 422 body has a list of error objects as "detail", but the
+# front-end shows "detail" as a message, so send a readable string instead
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(request: Request, exc: RequestValidationError):
+    """Return validation errors with a plain string detail"""
+    errors = exc.errors()
+    if any(err["type"] == "string_too_long" and err["loc"][-1] == "text" for err in errors):
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Text too long. Maximum allowed length is {MAX_TEXT_LENGTH} characters."}
+        )
+
+    messages = [
+        f"{'.'.join(str(part) for part in err['loc'][1:]) or 'body'}: {err['msg']}"
+        for err in errors
+    ]
+    return JSONResponse(status_code=422, content={"detail": "; ".join(messages)})
+
 def get_language_name(code: str) -> str:
     """Get language name from code"""
-    for lang in SUPPORTED_LANGUAGES:
-        if lang["code"] == code:
-            return lang["name"]
-    return "Unknown" # Return a default value
+    return _LANG_NAME.get(code, "Unknown")
+
+def check_languages(request: TranslationRequest):
+    """Reject unsupported language codes before calling the model"""
+    if request.target_language not in _LANG_NAME:
+        raise HTTPException(status_code=422, detail=f"Unsupported target_language: {request.target_language}")
+    if request.source_language != "auto" and request.source_language not in _LANG_NAME:
+        raise HTTPException(status_code=422, detail=f"Unsupported source_language: {request.source_language}")
 
 # API endpoint to get the list of languages
 @app.get("/languages", response_model=List[LanguageInfo])
 async def get_languages():
     """Get all supported languages"""
-    return SUPPORTED_LANGUAGES
+    return _LANG_RESPONSE
 
 # API endpoint that does the actual translation
 @app.post("/translate", response_model=TranslationResponse)
 async def translate_text(request: TranslationRequest):
     """Translate text using the generative model"""
     
-    if not os.getenv("GOOGLE_AI_API_KEY"):
+    if not GOOGLE_AI_API_KEY:
         raise HTTPException(status_code=500, detail="Google AI API key not configured. Please check your .env file.")
     
+    check_languages(request)
+    
     source_lang_name = get_language_name(request.source_language)
     target_lang_name = get_language_name(request.target_language)
     
+    ctx = f"- Use this context for better accuracy: {request.context}" if request.context else ""
     prompt = f"""Translate the following text from {source_lang_name} to {target_lang_name}.
     
     - Preserve the original tone and intent.
     - Naturally handle slang, idioms, and informal language.
-    {f"- Use this context for better accuracy: {request.context}" if request.context else ""}
+    {ctx}
     
     Text to translate: "{request.text}"
     
     Provide ONLY the translated text."""
         
     try:
-        model = genai.GenerativeModel('gemini-1.5-pro-latest') # Or your preferred model
-        response = model.generate_content(prompt)
+        response = await MODEL.generate_content_async(prompt)
         translated_text = response.text.strip()
         
         # Sometimes the model adds quotes, let's remove them.
         if translated_text.startswith('"') and translated_text.endswith('"'):
             translated_text = translated_text[1:-1]
 
-        return TranslationResponse(
+        return TranslationResponse.model_construct(
             translated_text=translated_text,
             source_language=request.source_language,
             target_language=request.target_language,
@@ -125,4 +179,15 @@ async def translate_text(request: TranslationRequest):
 if __name__ == "__main__":
     import uvicorn
     # The app will be available at http://127.0.0.1:8000
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # For development with auto-reload use: uvicorn main:app --reload
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        # Rate limits and the cache live in each worker's memory, so every extra
+        # worker raises the effective per-IP limit
+        workers=int(os.getenv("WORKERS", "1")),
+        loop="auto",  # uvloop/httptools when installed (uvicorn[standard])
+        http="auto",
+        reload=False
+    )
@@ -1,12 +1,19 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Optional, List
-from collections import defaultdict
-import requests
+from collections import defaultdict, OrderedDict
+import asyncio
+import functools
+import hashlib
+import httpx
+import orjson
 import os
 from dotenv import load_dotenv
-import json
+import re
 import time
 
 # Load environment variables from a .env file
@@ -17,42 +24,147 @@ MAX_REQUESTS = 20        # requests per window
 WINDOW_SECONDS = 3600    # 1 hour window
 ip_usage = defaultdict(list)  # { ip: [timestamps] }
 
+# Translation cache settings (LRU with a TTL)
+CACHE_MAX_ENTRIES = 4096
+CACHE_TTL_SECONDS = 3600
+translation_cache = OrderedDict()  # { (text, source, target, context): (response, timestamp) }
+pending_translations = {}  # { cache key: asyncio.Future } for translations currently in flight
+
 # Groq API - FREE and VERY FAST! Perfect for real-time translation
 # Get your free API key at: https://console.groq.com/keys
 # No credit card required! Very generous free tier
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_HEADERS = {
+    "Authorization": f"Bearer {GROQ_API_KEY}",
+    "Content-Type": "application/json"
+}
 
 # Fallback to Hugging Face if Groq is not available
 HF_API_KEY = os.getenv("HUGGINGFACE_API_KEY")
 HF_API_URL = "https://api-inference.huggingface.co/models/meta-llama/Meta-Llama-3-8B-Instruct"
 
+# Set STRICT_STARTUP=1 to refuse to start without an API key instead of failing on each request
+STRICT_STARTUP = os.getenv("STRICT_STARTUP", "").lower() in ("1", "true", "yes")
+if STRICT_STARTUP and not (GROQ_API_KEY or HF_API_KEY):
+    raise RuntimeError("No API key configured. Please set GROQ_API_KEY or HUGGINGFACE_API_KEY in your .env file.")
+
+# When both keys are set, Hugging Face is also asked if Groq hasn't answered within this many ms
+HEDGE_MS = int(os.getenv("HEDGE_MS", "300"))
+
+# Static parts of the translation prompt, only the languages/context/text change per request
+PROMPT_HEAD = "You are a professional translator. Translate the following text from "
+PROMPT_REQUIREMENTS = """.
+
+Requirements:
+- Preserve the original tone and intent
+- Naturally handle slang, idioms, and informal language
+- Keep the translation natural and fluent
+"""
+PROMPT_TEXT_LABEL = '\nText to translate: "'
+PROMPT_TAIL = '"\n\nProvide ONLY the translated text, nothing else.'
+
+GROQ_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a professional translator. Translate the text accurately, preserving tone, slang, and idioms. Return ONLY the translated text, nothing else."
+}
+
+# Batch translation prompt - the model answers with a JSON object so the results can be parsed back in order
+BATCH_PROMPT_HEAD = """Translate each numbered line below. Each line gives the source and target language in brackets, followed by the text as a JSON string.
+
+Requirements:
+- Preserve the original tone and intent
+- Naturally handle slang, idioms, and informal language
+- Keep the translation natural and fluent
+
+Return a JSON object of the form {"translations": [...]} where the array holds the translated texts as strings, in the same order as the lines, one entry per line.
+
+"""
+
+GROQ_BATCH_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a professional translator. Translate each text accurately, preserving tone, slang, and idioms. Respond ONLY with the requested JSON object."
+}
+
+# Wrapping quotes and "Translation:"-style prefixes the models sometimes add
+PREFIX_RE = re.compile(r"^\s*(?:translation|translated text|here'?s the translation)\s*:\s*", re.IGNORECASE)
+QUOTES_RE = re.compile(r'^"(.*)"$', re.DOTALL)
+TRAILING_RE = re.compile(r'\s*"?\s*$')  # whitespace/closing quote that may end a response
+
+# Shared HTTP client - keeps connections to Groq/HF alive between translations
+# so we don't pay for a new TCP + TLS handshake on every request
+GROQ_POOL_SIZE = int(os.getenv("GROQ_POOL_SIZE", "100"))
+HTTP: Optional[httpx.AsyncClient] = None
+
 app = FastAPI(
     title="Smart Translator API",
     description="Advanced translation API with context-awareness.",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Comma-separated list of front-end origins allowed to call the API,
+# e.g. ALLOWED_ORIGINS=http://127.0.0.1:5500,https://your-site.com
+# Falls back to "*" for development when it's not set
+ALLOWED_ORIGINS = [origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "").split(",") if origin.strip()] or ["*"]
+
 # This is CRUCIAL for allowing your front-end (Live Server)
 # to talk to your back-end (this Python file).
 app.add_middleware(
     CORSMiddleware,
-    # You can be more specific, but for development, "*" is okay.
     # The default for Live Server is often http://127.0.0.1:5500
-    # Change this bottom one to website url
-    # so API calls can just work off that url
-    allow_origins=["*"], 
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # Let browsers cache the preflight for a day
 )
 
+# Server-Sent Events have to reach the client as they're generated, so never compress them
+UNCOMPRESSED_PATHS = {"/translate/stream"}
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips the streaming endpoints"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in UNCOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Compress larger responses (language list, long translations); added after CORS
+# so it wraps the CORS middleware and compresses the final response
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=512, compresslevel=5)
+
+@app.on_event("startup")
+async def open_http_client():
+    """Create the shared HTTP client used for all upstream API calls"""
+    global HTTP
+    HTTP = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=GROQ_POOL_SIZE, max_keepalive_connections=GROQ_POOL_SIZE),
+        timeout=15
+    )
+
+@app.on_event("shutdown")
+async def close_http_client():
+    """Close the shared HTTP client"""
+    if HTTP is not None:
+        await HTTP.aclose()
+
+# Input limits for translation requests
+MAX_TEXT_LENGTH = 5000
+MAX_CONTEXT_LENGTH = 1000
+MAX_BATCH_ITEMS = MAX_REQUESTS  # each item counts against the hourly rate limit, so no batch can exceed it
+BATCH_CONCURRENCY = 8  # max single translations running at once for one batch
+
 # Pydantic models (defines the structure of data)
-class TranslationRequest(BaseModel):    
-    text: str
+class TranslationRequest(BaseModel):
+    # Length limits are checked before any LLM call (the UI caps input at 5000 characters)
+    text: str = Field(..., min_length=1, max_length=MAX_TEXT_LENGTH)
     source_language: Optional[str] = "auto"
     target_language: str
-    context: Optional[str] = None
+    context: Optional[str] = Field(None, max_length=MAX_CONTEXT_LENGTH)
 
 class TranslationResponse(BaseModel):
     translated_text: str
@@ -66,6 +178,9 @@ class LanguageInfo(BaseModel):
     name: str
     native_name: str
 
+class BatchRequest(BaseModel):
+    items: List[TranslationRequest] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
 # Supported languages (this is a shortened list for brevity, the original is fine)
 SUPPORTED_LANGUAGES = [
     {"code": "en", "name": "English", "native_name": "English"},
@@ -80,24 +195,65 @@ SUPPORTED_LANGUAGES = [
     # Add more languages l8r
 ]
 
+# Lookup tables built once at import so the hot paths don't rescan the list
+_LANG_NAME = {lang["code"]: lang["name"] for lang in SUPPORTED_LANGUAGES}
+
+# The language list only changes on deploy, so serialize it and compute its ETag once.
+# The ETag is weak because the same list may be sent gzipped or uncompressed
+_LANG_JSON = orjson.dumps(SUPPORTED_LANGUAGES)
+_LANG_ETAG = 'W/"' + hashlib.blake2b(_LANG_JSON, digest_size=8).hexdigest() + '"'
+_LANG_HEADERS = {"ETag": _LANG_ETAG, "Cache-Control": "public, max-age=86400", "Vary": "Accept-Encoding"}
+
+# Pydantic's default 422 body has a list of error objects as "detail", but the
+# front-end shows "detail" as a message, so send a readable string instead
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(request: Request, exc: RequestValidationError):
+    """Return validation errors with a plain string detail"""
+    errors = exc.errors()
+    if any(err["type"] == "string_too_long" and err["loc"][-1] == "text" for err in errors):
+        return ORJSONResponse(
+            status_code=413,
+            content={"detail": f"Text too long. Maximum allowed length is {MAX_TEXT_LENGTH} characters."}
+        )
+
+    messages = [
+        f"{'.'.join(str(part) for part in err['loc'][1:]) or 'body'}: {err['msg']}"
+        for err in errors
+    ]
+    return ORJSONResponse(status_code=422, content={"detail": "; ".join(messages)})
+
 def get_language_name(code: str) -> str:
     """Get language name from code"""
-    for lang in SUPPORTED_LANGUAGES:
-        if lang["code"] == code:
-            return lang["name"]
-    return "Unknown" 
+    return _LANG_NAME.get(code, "Unknown")
 
-# API endpoint to get the list of languages
-@app.get("/languages", response_model=List[LanguageInfo])
-async def get_languages():
-    """Get all supported languages"""
-    return SUPPORTED_LANGUAGES
+def translation_cache_key(payload: TranslationRequest) -> tuple:
+    """Build the cache key for a translation request"""
+    # Surrounding whitespace doesn't change the translation, so ignore it for keying
+    return (payload.text.strip(), payload.source_language, payload.target_language, payload.context)
 
-# API endpoint that does the actual translation
-@app.post("/translate", response_model=TranslationResponse)
-async def translate_text(payload: TranslationRequest, request: Request):
-    """Translate text using Groq/Hugging Face with basic IP rate limiting"""
-    
+def get_cached_translation(key: tuple) -> Optional[TranslationResponse]:
+    """Return a cached translation if it exists and hasn't expired"""
+    entry = translation_cache.get(key)
+    if entry is None:
+        return None
+
+    response, stored_at = entry
+    if time.monotonic() - stored_at > CACHE_TTL_SECONDS:
+        del translation_cache[key]
+        return None
+
+    translation_cache.move_to_end(key)
+    return response
+
+def store_cached_translation(key: tuple, response: TranslationResponse):
+    """Cache a translation, evicting the least recently used entry when full"""
+    translation_cache[key] = (response, time.monotonic())
+    translation_cache.move_to_end(key)
+    if len(translation_cache) > CACHE_MAX_ENTRIES:
+        translation_cache.popitem(last=False)
+
+def check_rate_limit(request: Request, cost: int = 1):
+    """Raise a 429 if the client IP doesn't have `cost` requests left in this window"""
     now = time.time()
     client_ip = request.client.host if request.client else "unknown"
 
@@ -105,55 +261,259 @@ async def translate_text(payload: TranslationRequest, request: Request):
     recent_requests = [ts for ts in ip_usage[client_ip] if now - ts < WINDOW_SECONDS]
     ip_usage[client_ip] = recent_requests
 
-    if len(recent_requests) >= MAX_REQUESTS:
+    if len(recent_requests) + cost > MAX_REQUESTS:
         raise HTTPException(
             status_code=429,
             detail="Rate limit exceeded. Please wait a moment before trying again."
         )
 
-    # Record this request
-    ip_usage[client_ip].append(now)
+    # Record this request (a batch counts once per item)
+    ip_usage[client_ip].extend([now] * cost)
 
-     # - Prevents from abusing the API -
-    if len(payload.text) > 5000:
-        raise HTTPException(
-            status_code=413,
-            detail="Text too long. Maximum allowed length is 5000 characters."
-        )
+def check_languages(payload: TranslationRequest):
+    """Reject unsupported language codes before calling the model"""
+    if payload.target_language not in _LANG_NAME:
+        raise HTTPException(status_code=422, detail=f"Unsupported target_language: {payload.target_language}")
+    if payload.source_language != "auto" and payload.source_language not in _LANG_NAME:
+        raise HTTPException(status_code=422, detail=f"Unsupported source_language: {payload.source_language}")
+
+@functools.lru_cache(maxsize=512)
+def prompt_scaffold(source_language: str, target_language: str, has_context: bool) -> tuple:
+    """Build the static parts of the prompt around the context and text, cached per language pair"""
+    source_lang_name = get_language_name(source_language) if source_language != "auto" else "the detected language"
+    target_lang_name = get_language_name(target_language)
+    head = "".join((PROMPT_HEAD, source_lang_name, " to ", target_lang_name, PROMPT_REQUIREMENTS))
+    if has_context:
+        return head + "- Context: ", "\n" + PROMPT_TEXT_LABEL
+    return head, PROMPT_TEXT_LABEL
+
+def build_prompt(payload: TranslationRequest) -> str:
+    """Build the LLM prompt for a translation request"""
+    head, middle = prompt_scaffold(payload.source_language, payload.target_language, bool(payload.context))
+    return "".join((head, payload.context or "", middle, payload.text, PROMPT_TAIL))
+
+def build_groq_payload(prompt: str, stream: bool = False, system_message: dict = GROQ_SYSTEM_MESSAGE, max_tokens: int = 500, json_mode: bool = False) -> dict:
+    """Build the chat completion request body for Groq"""
+    payload = {
+        "messages": [
+            system_message,
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "model": "llama-3.1-8b-instant",  # Fast and free model
+        "temperature": 0.3,
+        "max_tokens": max_tokens,
+        "stream": stream
+    }
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    return payload
+
+# API endpoint to get the list of languages
+@app.get("/languages", response_model=List[LanguageInfo])
+async def get_languages(request: Request):
+    """Get all supported languages"""
+    # Client already has this exact list
+    if _LANG_ETAG in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=_LANG_HEADERS)
+    return Response(_LANG_JSON, media_type="application/json", headers=_LANG_HEADERS)
+
+# API endpoint that does the actual translation
+@app.post("/translate", response_model=TranslationResponse)
+async def translate_text(payload: TranslationRequest, request: Request):
+    """Translate text using Groq/Hugging Face with basic IP rate limiting"""
     
-    if not payload.text or not payload.text.strip():
-        return TranslationResponse(
+    check_rate_limit(request)
+    check_languages(payload)
+    return await translate_payload(payload)
+
+async def translate_payload(payload: TranslationRequest) -> TranslationResponse:
+    """Translate a single request, using the cache and sharing in-flight calls"""
+    if not payload.text.strip():
+        return TranslationResponse.model_construct(
             translated_text="",
             source_language=payload.source_language,
             target_language=payload.target_language,
             confidence=0.0,
             ai_enhanced=True
         )
+
+    # Same text was translated recently, skip the LLM round trip
+    cache_key = translation_cache_key(payload)
+    cached = get_cached_translation(cache_key)
+    if cached is not None:
+        return cached
+
+    # Same translation is already in flight, wait for it instead of calling the API again
+    while cache_key in pending_translations:
+        pending = pending_translations[cache_key]
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # Only the request that started the call was cancelled, take over from it
+            if not pending.cancelled():
+                raise
+
+    future = asyncio.get_running_loop().create_future()
+    pending_translations[cache_key] = future
+    try:
+        prompt = build_prompt(payload)
+        response = await call_translation_api(payload, prompt)
+        store_cached_translation(cache_key, response)
+        future.set_result(response)
+        return response
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark as retrieved so there's no warning when nobody was waiting
+        raise
+    except BaseException:
+        # Cancelled (e.g. client disconnected), don't leave the waiters hanging
+        future.cancel()
+        raise
+    finally:
+        del pending_translations[cache_key]
+
+# Translate a list of texts in one go - cache misses are sent to Groq as a single
+# prompt instead of one request each
+@app.post("/translate/batch", response_model=List[TranslationResponse])
+async def translate_batch(batch: BatchRequest, request: Request):
+    """Translate several texts with a single LLM call when possible"""
     
-    source_lang_name = get_language_name(payload.source_language) if payload.source_language != "auto" else "the detected language"
-    target_lang_name = get_language_name(payload.target_language)
-    
-    # Prompting the LLM (API request)
-    prompt = f"""You are a professional translator. Translate the following text from {source_lang_name} to {target_lang_name}.
+    check_rate_limit(request, cost=len(batch.items))
+    for item in batch.items:
+        check_languages(item)
 
-Requirements:
-- Preserve the original tone and intent
-- Naturally handle slang, idioms, and informal language
-- Keep the translation natural and fluent
-{f"- Context: {payload.context}" if payload.context else ""}
+    missing = [
+        item for item in batch.items
+        if item.text.strip() and get_cached_translation(translation_cache_key(item)) is None
+    ]
+
+    if GROQ_API_KEY and len(missing) > 1:
+        try:
+            translations = await translate_batch_with_groq(missing)
+            for item, translated_text in zip(missing, translations):
+                store_cached_translation(translation_cache_key(item), TranslationResponse.model_construct(
+                    translated_text=translated_text,
+                    source_language=item.source_language,
+                    target_language=item.target_language,
+                    confidence=0.95,
+                    ai_enhanced=True
+                ))
+        except Exception as e:
+            # Anything not cached above is translated one by one below
+            print(f"Batch translation failed, falling back to single requests: {e}")
 
-Text to translate: "{payload.text}"
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
 
-Provide ONLY the translated text, nothing else."""
+    async def translate_limited(item: TranslationRequest) -> TranslationResponse:
+        async with semaphore:
+            return await translate_payload(item)
+
+    return await asyncio.gather(*(translate_limited(item) for item in batch.items))
+
+# Streaming version of /translate - sends the translation as Server-Sent Events
+# while Groq is still generating it, so the UI can show text right away
+@app.post("/translate/stream")
+async def translate_text_stream(payload: TranslationRequest, request: Request):
+    """Stream a translation from Groq as Server-Sent Events"""
     
+    check_rate_limit(request)
+    check_languages(payload)
+
+    if not GROQ_API_KEY:
+        raise HTTPException(
+            status_code=500,
+            detail="Streaming requires GROQ_API_KEY. Get a free key at: https://console.groq.com/keys"
+        )
+
+    cache_key = translation_cache_key(payload)
+    prompt = build_prompt(payload)
+
+    return StreamingResponse(
+        stream_groq_translation(payload, cache_key, prompt),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+def sse_event(data: dict) -> bytes:
+    """Format a dict as a Server-Sent Events data line"""
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+async def stream_groq_translation(payload: TranslationRequest, cache_key: tuple, prompt: str):
+    """Yield translated text chunks from Groq as SSE events, then cache the full result"""
+    # Nothing to translate, same empty result /translate returns
+    if not payload.text.strip():
+        yield sse_event({"done": True, "text": ""})
+        yield b"data: [DONE]\n\n"
+        return
+
+    # Already translated, send it in one go
+    cached = get_cached_translation(cache_key)
+    if cached is not None:
+        yield sse_event({"text": cached.translated_text})
+        yield sse_event({"done": True, "text": cached.translated_text})
+        yield b"data: [DONE]\n\n"
+        return
+
+    chunks = []
+    cleaner = StreamCleaner()
+    try:
+        async with HTTP.stream("POST", GROQ_API_URL, headers=GROQ_HEADERS, content=orjson.dumps(build_groq_payload(prompt, stream=True))) as response:
+            if response.status_code != 200:
+                error_msg = (await response.aread()).decode(errors="replace")
+                raise Exception(f"Groq API error: {error_msg}")
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+
+                content = orjson.loads(data)["choices"][0]["delta"].get("content")
+                if content:
+                    chunks.append(content)
+                    text = cleaner.feed(content)
+                    if text:
+                        yield sse_event({"text": text})
+
+        text = cleaner.finish()
+        if text:
+            yield sse_event({"text": text})
+    except Exception as e:
+        # Headers are already sent, so report the failure as an event
+        print(f"Translation error: {e}")
+        yield sse_event({"error": f"Translation failed: {str(e)}"})
+        return
+
+    translated_text = clean_llm_output("".join(chunks))
+    store_cached_translation(cache_key, TranslationResponse.model_construct(
+        translated_text=translated_text,
+        source_language=payload.source_language,
+        target_language=payload.target_language,
+        confidence=0.95,
+        ai_enhanced=True
+    ))
+    # Same text /translate would return - clients should replace the streamed text with it
+    yield sse_event({"done": True, "text": translated_text})
+    yield b"data: [DONE]\n\n"
+
+async def call_translation_api(payload: TranslationRequest, prompt: str) -> TranslationResponse:
+    """Send the prompt to the first configured translation backend"""
     try:
+        # Both configured, race them if Groq is slow
+        if GROQ_API_KEY and HF_API_KEY:
+            return await translate_hedged(payload, prompt)
+
         # Try Groq first (faster and free)
         if GROQ_API_KEY:
-            return await translate_with_groq(payload, source_lang_name, target_lang_name, prompt)
+            return await translate_with_groq(payload, prompt)
         
         # Fallback to Hugging Face
         if HF_API_KEY:
-            return await translate_with_huggingface(payload, source_lang_name, target_lang_name, prompt)
+            return await translate_with_huggingface(payload, prompt)
         
         # If no API keys, provide helpful error
         raise HTTPException(
@@ -167,49 +527,112 @@ Provide ONLY the translated text, nothing else."""
         print(f"Translation error: {e}")
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
-async def translate_with_groq(request: TranslationRequest, source_lang_name: str, target_lang_name: str, prompt: str):
+async def translate_hedged(payload: TranslationRequest, prompt: str) -> TranslationResponse:
+    """Ask Groq first and hedge with Hugging Face if Groq is slow or fails, returning whichever succeeds first"""
+    groq_task = asyncio.create_task(translate_with_groq(payload, prompt))
+    pending = {groq_task}
+    try:
+        # Give Groq a head start so the usual fast path doesn't cost a second API call
+        await asyncio.wait(pending, timeout=HEDGE_MS / 1000)
+        if not groq_task.done() or groq_task.exception() is not None:
+            pending.add(asyncio.create_task(translate_with_huggingface(payload, prompt)))
+
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Read every exception first so a failed task is never left unretrieved
+            results = [(task, task.exception()) for task in done]
+            for task, task_error in results:
+                if task_error is None:
+                    return task.result()
+                error = task_error
+        if error is None:
+            raise Exception("No translation backend returned a result")
+        raise error
+    finally:
+        # Stop the slower request
+        for task in pending:
+            task.cancel()
+
+def clean_llm_output(translated_text: str) -> str:
+    """Strip wrapping quotes and filler prefixes from a model response"""
+    translated_text = translated_text.strip()
+    match = QUOTES_RE.match(translated_text)
+    if match:
+        translated_text = match.group(1)
+    translated_text, prefixes_removed = PREFIX_RE.subn("", translated_text, count=1)
+    return translated_text.strip() if prefixes_removed else translated_text
+
+class StreamCleaner:
+    """Applies clean_llm_output's quote/prefix stripping to a response while it streams in"""
+
+    # Characters to buffer before deciding whether the response starts with a prefix like "Translation:"
+    HEAD_CHARS = 32
+
+    def __init__(self):
+        self.head = ""  # start of the response, held until the prefix/opening quote is known
+        self.started = False
+        self.quoted = False
+        self.prefixed = False
+        self.tail = ""  # trailing whitespace/quote, held until more text or the end arrives
+
+    def feed(self, chunk: str) -> str:
+        """Take the next chunk and return the text that is safe to send"""
+        if self.started:
+            return self._release(chunk)
+
+        self.head += chunk
+        body = self.head.lstrip()
+        if body.startswith('"'):
+            body = body[1:]
+        match = PREFIX_RE.match(body)
+        if len(body) < self.HEAD_CHARS or body[-1].isspace() or (match and match.end() == len(body)):
+            return ""
+        return self._start()
+
+    def finish(self) -> str:
+        """Return whatever is still held back once the response is complete"""
+        text = "" if self.started else self._start()
+        tail = self.tail.rstrip()
+        if self.quoted and tail.endswith('"'):
+            tail = tail[:-1]
+        if self.prefixed:
+            # Like clean_llm_output, text after a removed prefix is stripped
+            tail = tail.rstrip()
+        return text + tail
+
+    def _start(self) -> str:
+        text = self.head.lstrip()
+        self.quoted = text.startswith('"')
+        if self.quoted:
+            text = text[1:]
+        self.started = True
+        text, prefixes_removed = PREFIX_RE.subn("", text, count=1)
+        self.prefixed = bool(prefixes_removed)
+        return self._release(text)
+
+    def _release(self, text: str) -> str:
+        text = self.tail + text
+        end = TRAILING_RE.search(text).start()
+        self.tail = text[end:]
+        return text[:end]
+
+async def translate_with_groq(request: TranslationRequest, prompt: str):
     """Translate using Groq API (fast and free)"""
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    payload = {
-        "messages": [
-            {
-                "role": "system",
-                "content": "You are a professional translator. Translate the text accurately, preserving tone, slang, and idioms. Return ONLY the translated text, nothing else."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        "model": "llama-3.1-8b-instant",  # Fast and free model
-        "temperature": 0.3,
-        "max_tokens": 500
-    }
-    
-    response = requests.post(GROQ_API_URL, headers=headers, json=payload, timeout=15)
+    payload = build_groq_payload(prompt)
+    response = await HTTP.post(GROQ_API_URL, headers=GROQ_HEADERS, content=orjson.dumps(payload))
     
     if response.status_code != 200:
         error_msg = response.text
         raise Exception(f"Groq API error: {error_msg}")
     
-    result = response.json()
+    result = orjson.loads(response.content)
     translated_text = result["choices"][0]["message"]["content"].strip()
     
     # Clean up the response
-    translated_text = translated_text.strip()
-    if translated_text.startswith('"') and translated_text.endswith('"'):
-        translated_text = translated_text[1:-1]
-    
-    prefixes = ["Translation:", "Translated text:", "Here's the translation:"]
-    for prefix in prefixes:
-        if translated_text.lower().startswith(prefix.lower()):
-            translated_text = translated_text[len(prefix):].strip()
+    translated_text = clean_llm_output(translated_text)
     
-    return TranslationResponse(
+    return TranslationResponse.model_construct(
         translated_text=translated_text,
         source_language=request.source_language,
         target_language=request.target_language,
@@ -217,9 +640,44 @@ async def translate_with_groq(request: TranslationRequest, source_lang_name: str
         ai_enhanced=True
     )
 
-async def translate_with_huggingface(request: TranslationRequest, source_lang_name: str, target_lang_name: str, prompt: str):
+async def translate_batch_with_groq(items: List[TranslationRequest]) -> List[str]:
+    """Translate several requests with one Groq call, returning the texts in order"""
+    lines = []
+    for number, item in enumerate(items, start=1):
+        source_lang_name = get_language_name(item.source_language) if item.source_language != "auto" else "the detected language"
+        target_lang_name = get_language_name(item.target_language)
+        # Quote the text as JSON so multi-line texts stay on their numbered line
+        line = f"{number}. [{source_lang_name} to {target_lang_name}] {orjson.dumps(item.text).decode()}"
+        if item.context:
+            line += f" (Context: {item.context})"
+        lines.append(line)
+
+    prompt = BATCH_PROMPT_HEAD + "\n".join(lines)
+    payload = build_groq_payload(
+        prompt,
+        system_message=GROQ_BATCH_SYSTEM_MESSAGE,
+        max_tokens=min(500 * len(items), 8000),
+        json_mode=True
+    )
+    response = await HTTP.post(GROQ_API_URL, headers=GROQ_HEADERS, content=orjson.dumps(payload))
+    
+    if response.status_code != 200:
+        raise Exception(f"Groq API error: {response.text}")
+    
+    result = orjson.loads(response.content)
+    translations = orjson.loads(result["choices"][0]["message"]["content"])["translations"]
+
+    if not isinstance(translations, list) or len(translations) != len(items) or not all(isinstance(t, str) for t in translations):
+        raise Exception("Groq returned a translation list that doesn't match the batch")
+
+    return [clean_llm_output(translated_text) for translated_text in translations]
+
+async def translate_with_huggingface(request: TranslationRequest, prompt: str):
     """Translate using Hugging Face API (fallback)"""
-    headers = {"Authorization": f"Bearer {HF_API_KEY}"}
+    headers = {
+        "Authorization": f"Bearer {HF_API_KEY}",
+        "Content-Type": "application/json"
+    }
     
     payload = {
         "inputs": prompt,
@@ -230,7 +688,7 @@ async def translate_with_huggingface(request: TranslationRequest, source_lang_na
         }
     }
     
-    response = requests.post(HF_API_URL, headers=headers, json=payload, timeout=30)
+    response = await HTTP.post(HF_API_URL, headers=headers, content=orjson.dumps(payload), timeout=30)
     
     if response.status_code == 503:
         raise HTTPException(status_code=503, detail="Model is loading. Please try again in a few seconds.")
@@ -238,7 +696,7 @@ async def translate_with_huggingface(request: TranslationRequest, source_lang_na
     if response.status_code != 200:
         raise Exception(f"Hugging Face API error: {response.text}")
     
-    result = response.json()
+    result = orjson.loads(response.content)
     
     # Extract the translated text from the response
     if isinstance(result, list) and len(result) > 0:
@@ -249,16 +707,9 @@ async def translate_with_huggingface(request: TranslationRequest, source_lang_na
         translated_text = str(result).strip()
     
     # Clean up the response
-    translated_text = translated_text.strip()
-    if translated_text.startswith('"') and translated_text.endswith('"'):
-        translated_text = translated_text[1:-1]
+    translated_text = clean_llm_output(translated_text)
     
-    prefixes = ["Translation:", "Translated text:", "Here's the translation:"]
-    for prefix in prefixes:
-        if translated_text.lower().startswith(prefix.lower()):
-            translated_text = translated_text[len(prefix):].strip()
-    
-    return TranslationResponse(
+    return TranslationResponse.model_construct(
         translated_text=translated_text,
         source_language=request.source_language,
         target_language=request.target_language,
@@ -271,4 +722,15 @@ async def translate_with_huggingface(request: TranslationRequest, source_lang_na
 if __name__ == "__main__":
     import uvicorn
     # The app will be available at http://127.0.0.1:8000
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # For development with auto-reload use: uvicorn main:app --reload
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        # Rate limits and the cache live in each worker's memory, so every extra
+        # worker raises the effective per-IP limit
+        workers=int(os.getenv("WORKERS", "1")),
+        loop="auto",  # uvloop/httptools when installed (uvicorn[standard])
+        http="auto",
+        reload=False
+    )